@@ -1,26 +1,9 @@
-import configparser
 import os
+import re
 from pathlib import Path
+from typing import Dict
 
-
-class ConfigManager:
-    def __init__(self, config_path: Path):
-        self.config_path = config_path
-        self.config = configparser.ConfigParser()
-
-        if not config_path.exists():
-            self.create_default_config()
-
-        self.load_config()
-        self.validate_config()
-
-    def create_default_config(self):
-        userprofile = os.environ.get("USERPROFILE", os.path.expanduser("~"))
-        programfiles_x86 = os.environ.get(
-            "PROGRAMFILES(X86)", "C:\\Program Files (x86)"
-        )
-
-        default_config = f"""[PATHS]
+DEFAULT_CONFIG_TEMPLATE = """[PATHS]
 # Directory where packages are downloaded
 download_dir = {userprofile}\\Downloads
 
@@ -72,10 +55,111 @@ use_custom_files = false
 
 # Delete package after installation
 delete_package = false
+
+# Print detailed progress (URLs, paths) while updating
+verbose = false
 """
 
-        with open(self.config_path, "w") as f:
-            f.write(default_config)
+REQUIRED_SECTIONS = ("PATHS", "LOGIN", "SETTINGS", "VCCS", "OPTIONS")
+
+
+class FastConfigParser:
+    """Minimal INI reader covering the subset of syntax used by config.ini"""
+
+    # Section headers may carry a trailing comment, e.g. "[PATHS] ; note"
+    SECTION_RE = re.compile(r"^\[([^\]]+)\]\s*(?:[#;].*)?$")
+    # A line starting with "[" is a header, never an option
+    OPTION_RE = re.compile(r"^([^=:\s\[][^=:]*?)\s*[=:]\s*(.*)$")
+    BOOLEAN_STATES = {
+        "1": True,
+        "yes": True,
+        "true": True,
+        "on": True,
+        "0": False,
+        "no": False,
+        "false": False,
+        "off": False,
+    }
+
+    def __init__(self):
+        self._sections: Dict[str, Dict[str, str]] = {}
+
+    def read(self, path: Path):
+        with open(path, "r") as f:
+            lines = f.read().splitlines()
+
+        section = None
+        option = None
+        for line_number, raw_line in enumerate(lines, start=1):
+            line = raw_line.strip()
+            if not line or line[0] in "#;":
+                continue
+
+            # Indented lines continue the previous value, as in configparser
+            if raw_line[0].isspace() and option is not None:
+                section[option] += f"\n{line}"
+                continue
+
+            match = self.SECTION_RE.match(line)
+            if match:
+                section = self._sections.setdefault(match.group(1), {})
+                option = None
+                continue
+
+            match = self.OPTION_RE.match(line)
+            if match and section is not None:
+                option = match.group(1).lower()
+                section[option] = match.group(2).strip()
+                continue
+
+            raise ValueError(f"Could not parse {path} line {line_number}: {line}")
+
+    def sections(self):
+        return list(self._sections)
+
+    def __contains__(self, section: str) -> bool:
+        return section in self._sections
+
+    def __getitem__(self, section: str) -> Dict[str, str]:
+        return self._sections[section]
+
+    def get(self, section: str, key: str, fallback: str = "") -> str:
+        return self._sections.get(section, {}).get(key.lower(), fallback)
+
+    def getboolean(self, section: str, key: str, fallback: bool = False) -> bool:
+        value = self._sections.get(section, {}).get(key.lower())
+        if value is None:
+            return fallback
+
+        if value.lower() not in self.BOOLEAN_STATES:
+            raise ValueError(f"Not a boolean: {value}")
+
+        return self.BOOLEAN_STATES[value.lower()]
+
+
+class ConfigManager:
+    def __init__(self, config_path: Path):
+        self.config_path = config_path
+        self.config = FastConfigParser()
+
+        if not config_path.exists():
+            self.create_default_config()
+
+        self.load_config()
+        self.validate_config()
+        self.load_settings()
+
+    def create_default_config(self):
+        userprofile = os.environ.get("USERPROFILE", os.path.expanduser("~"))
+        programfiles_x86 = os.environ.get(
+            "PROGRAMFILES(X86)", "C:\\Program Files (x86)"
+        )
+
+        self.config_path.write_text(
+            DEFAULT_CONFIG_TEMPLATE.format(
+                userprofile=userprofile, programfiles_x86=programfiles_x86
+            )
+        )
 
         print(f"✓ Created default configuration at {self.config_path}")
         print(
@@ -87,11 +171,10 @@ delete_package = false
         self.config.read(self.config_path)
 
     def validate_config(self):
-        required_sections = ["PATHS", "LOGIN", "SETTINGS", "VCCS", "OPTIONS"]
-
-        for section in required_sections:
-            if section not in self.config:
-                raise ValueError(f"Missing required configuration section: [{section}]")
+        missing = set(REQUIRED_SECTIONS) - set(self.config.sections())
+        if missing:
+            section = next(s for s in REQUIRED_SECTIONS if s in missing)
+            raise ValueError(f"Missing required configuration section: [{section}]")
 
         if self.config["LOGIN"]["cid"] == "YOUR_VATSIM_ID":
             raise ValueError(
@@ -108,70 +191,25 @@ delete_package = false
         path_str = self.get(section, key, fallback)
         return Path(path_str) if path_str else Path()
 
-    @property
-    def download_dir(self) -> Path:
-        return self.getpath("PATHS", "download_dir")
-
-    @property
-    def euroscope_docs(self) -> Path:
-        return self.getpath("PATHS", "euroscope_docs")
-
-    @property
-    def euroscope_app(self) -> Path:
-        return self.getpath("PATHS", "euroscope_app")
-
-    @property
-    def backup_dir(self) -> Path:
-        return self.getpath("PATHS", "backup_dir")
-
-    @property
-    def navdata_dir(self) -> Path:
-        return self.getpath("PATHS", "navdata_dir")
-
-    @property
-    def custom_files_dir(self) -> Path:
-        return self.getpath("PATHS", "custom_files_dir")
-
-    @property
-    def vatsim_cid(self) -> str:
-        return self.get("LOGIN", "cid")
-
-    @property
-    def vatsim_password(self) -> str:
-        return self.get("LOGIN", "password")
-
-    @property
-    def real_name(self) -> str:
-        return self.get("LOGIN", "name")
-
-    @property
-    def rating(self) -> str:
-        return self.get("LOGIN", "rating")
-
-    @property
-    def initials(self) -> str:
-        return self.get("LOGIN", "initials")
-
-    @property
-    def hoppie_code(self) -> str:
-        return self.get("LOGIN", "hoppie")
-
-    @property
-    def observer_callsign(self) -> str:
-        return f"{self.initials}_OBS"
-
-    @property
-    def text_size(self) -> str:
-        return self.get("SETTINGS", "text_size")
-
-    @property
-    def use_subdirs(self) -> bool:
-        return self.getboolean("OPTIONS", "use_subdirs")
-
-    @property
-    def use_custom_files(self) -> bool:
-        return self.getboolean("OPTIONS", "use_custom_files")
-
-    @property
-    def delete_package(self) -> bool:
-        return self.getboolean("OPTIONS", "delete_package")
+    def load_settings(self):
+        self.download_dir = self.getpath("PATHS", "download_dir")
+        self.euroscope_docs = self.getpath("PATHS", "euroscope_docs")
+        self.euroscope_app = self.getpath("PATHS", "euroscope_app")
+        self.backup_dir = self.getpath("PATHS", "backup_dir")
+        self.navdata_dir = self.getpath("PATHS", "navdata_dir")
+        self.custom_files_dir = self.getpath("PATHS", "custom_files_dir")
+
+        self.vatsim_cid = self.get("LOGIN", "cid")
+        self.vatsim_password = self.get("LOGIN", "password")
+        self.real_name = self.get("LOGIN", "name")
+        self.rating = self.get("LOGIN", "rating")
+        self.initials = self.get("LOGIN", "initials")
+        self.hoppie_code = self.get("LOGIN", "hoppie")
+        self.observer_callsign = f"{self.initials}_OBS"
+
+        self.text_size = self.get("SETTINGS", "text_size")
+
+        self.use_subdirs = self.getboolean("OPTIONS", "use_subdirs")
+        self.use_custom_files = self.getboolean("OPTIONS", "use_custom_files")
+        self.delete_package = self.getboolean("OPTIONS", "delete_package")
+        self.verbose = self.getboolean("OPTIONS", "verbose")
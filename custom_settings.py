@@ -1,47 +1,206 @@
+import fnmatch
+import os
 import re
+import shutil
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from parallel import for_each
+from profile_updater import PROFILE_WALK_SKIP_DIRS
+
+# Patterns without any of these can be applied with bytes.replace; line breaks
+# are included because text patterns see \r\n as \n
+_REGEX_METACHARACTERS = frozenset("\\.^$*+?{}[]|()\r\n")
+
+# Compiled regexes keyed by pattern, shared across calls and files
+_PATTERN_CACHE: Dict[Union[str, bytes], "re.Pattern"] = {}
+
+
+def _compile_pattern(pattern: Union[str, bytes]) -> "re.Pattern":
+    """Compile a regex on first use and reuse it afterwards"""
+    compiled = _PATTERN_CACHE.get(pattern)
+    if compiled is None:
+        compiled = _PATTERN_CACHE[pattern] = re.compile(pattern, flags=re.MULTILINE)
+    return compiled
+
+
+def _sub_text(compiled: "re.Pattern", replacement: str, content: bytes) -> bytes:
+    """Run a text regex on iso-8859-1 content as if the file was opened in text mode"""
+    text = content.decode("iso-8859-1")
+
+    # Text mode reads \r\n as \n; put the file's own line endings back afterwards
+    crlf = "\r\n" in text
+    if crlf:
+        text = text.replace("\r\n", "\n")
+
+    text = compiled.sub(replacement, text)
+
+    if crlf:
+        text = text.replace("\n", "\r\n")
+    return text.encode("iso-8859-1")
+
+
+def _rewrite_settings(
+    content: bytes, updates: Dict[bytes, bytes], delimiter: bytes
+) -> bytes:
+    """Replace the value of every "setting<delimiter>value" line found in updates"""
+    lines = content.split(b"\n")
+
+    for i, line in enumerate(lines):
+        # Setting names may contain the delimiter themselves (e.g. "Metar:normal"),
+        # so try every delimiter position from left to right
+        end = line.find(delimiter)
+        while end != -1:
+            setting = line[:end]
+            if setting in updates:
+                value_end = len(line) - 1 if line.endswith(b"\r") else len(line)
+                if value_end > end + len(delimiter):
+                    lines[i] = (
+                        setting + delimiter + updates[setting] + line[value_end:]
+                    )
+                break
+            end = line.find(delimiter, end + 1)
+
+    return b"\n".join(lines)
+
+
+def _iter_files(
+    base_dir: Path, suffix: str = "", skip_dirs: frozenset = frozenset()
+) -> Iterator[str]:
+    """Yield the paths of all files below base_dir ending in suffix, minus skip_dirs"""
+    suffix = os.path.normcase(suffix)
+    stack = [str(base_dir)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() not in skip_dirs:
+                            stack.append(entry.path)
+                    elif os.path.normcase(entry.name).endswith(suffix):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _name_matcher(pattern: str) -> Callable[[str], bool]:
+    """Return a file name test for pattern, skipping fnmatch for "prefix*suffix" """
+    if pattern.count("*") != 1 or "?" in pattern or "[" in pattern:
+        return lambda name: fnmatch.fnmatch(name, pattern)
+
+    prefix, suffix = os.path.normcase(pattern).split("*")
+    min_length = len(prefix) + len(suffix)
+
+    def matches(name: str) -> bool:
+        if len(name) < min_length:
+            return False
+        name = os.path.normcase(name)
+        return name.startswith(prefix) and name.endswith(suffix)
+
+    return matches
+
+
+# Map edits made by _apply_edgg_settings
+_EDDL_LEADIN_RE = re.compile(
+    rb"(MAP:Leadin Lines\s+AIRPORT:EDDL\s+FOLDER:Airport Layout\s+COLOR:layout-taxiline-yellow)\s*?(\r?\n)(//)",
+    re.MULTILINE,
+)
+# Aircraft Outlines, Checkpoints, Stands and Areas maps, ACTIVE:1 -> ACTIVE:0
+_EDDL_ACTIVE_MAPS_RE = re.compile(
+    rb"(MAP:(?:Aircraft Outlines\s+AIRPORT:EDDL\s+FOLDER:Apron Info"
+    rb"|(?:Checkpoints|Stands|Areas)\s+AIRPORT:EDDL\s+FOLDER:Labels)\s+ACTIVE:)1",
+    re.MULTILINE,
+)
+_EDDL_DOWNWIND_RE = re.compile(
+    rb"(MAP:DOWNWIND (05|23)\s+COLOR:standard\s+FOLDER:EDDL\s+)(ZOOM:)",
+    re.MULTILINE,
+)
+# Downwind map direction -> arrival runways that activate it
+_EDDL_DOWNWIND_RUNWAYS = {b"05": (b"05L", b"05R"), b"23": (b"23R", b"23L")}
+_PHX_URBAN_AREA_RE = re.compile(
+    rb"(MAP:Urban Area\s+FOLDER:Topography\s+ASRDATA:PHOENIX\s+LAYER:-4\s+)ACTIVE:ID:\*:DFC,DFGW,DFGC,DFGE,DFGI,DFG,DFTC,DFTS,DFTN,DFTW,DFAN,DFAS,DFANT,DFAST:\*:\*\s+AND_ACTIVE:ID:\*:DLC,DLGE,DLGW,DLT,DLA,DLAT,DLD,BOT:\*:\*\s+AND_ACTIVE:ID:\*:DKC,DKG,DKT,DKA,DKAT,NOR:\*:\*(\s+COLOR:)",
+    re.MULTILINE,
+)
+_PHX_HIGHWAYS_RE = re.compile(
+    rb"(MAP:Highways\s+FOLDER:Topography\s+ASRDATA:PHOENIX\s+LAYER:-2\s+COLOR:topo_road\s+STYLE:Solid:1\s+)ACTIVE:ID:\*:DFC,DFGW,DFGC,DFGE,DFGI,DFG,DFTC,DFTS,DFTN,DFTW,DFAN,DFAS,DFANT,DFAST:\*:\*\s+AND_ACTIVE:ID:\*:DLC,DLGE,DLGW,DLT,DLA,DLAT,DLD,BOT:\*:\*\s+AND_ACTIVE:ID:\*:DKC,DKG,DKT,DKA,DKAT,NOR:\*:\*(\s+COORD:)",
+    re.MULTILINE,
+)
 
 
 class CustomSettings:
     def __init__(self, config):
         self.config = config
+        self._profile_cache: Optional[Tuple[Path, List[Path]]] = None
+        # File contents waiting to be written, only set during apply_all_settings
+        self._staged: Optional[Dict[Path, bytes]] = None
+        # Progress messages waiting to be printed, only set during apply_all_settings
+        self._messages: Optional[List[str]] = None
+
+        # FIR code -> settings method, register new FIRs here
+        self._fir_dispatch = {
+            "EDGG": self._apply_edgg_settings,
+            "EDMM": self._apply_edmm_settings,
+            "EDWW": self._apply_edww_settings,
+            "EDXX": self._apply_edxx_settings,
+            "EXCXO": self._apply_excxo_settings,
+        }
 
     def apply_all_settings(self, package_info: Dict[str, str]):
         """Apply all custom settings for the package"""
         print("⚙️  Applying custom settings...")
 
         fir_code = package_info["fir"]
-        base_dir = self._get_base_dir(package_info)
+        base_dir = self._get_base_dir(fir_code)
+
+        # Walk the tree for profiles once and reuse it for every helper call
+        self._profile_cache = (
+            base_dir,
+            [
+                Path(p)
+                for p in _iter_files(base_dir, ".prf", PROFILE_WALK_SKIP_DIRS)
+            ],
+        )
+        # Collect edits in memory so files touched by several helpers are written once
+        self._staged = {}
+        # Print progress in one go at the end instead of once per file
+        self._messages = []
 
-        # Apply your custom settings here!
+        try:
+            # Apply your custom settings here!
 
-        # ========================================
-        # GENERAL SETTINGS (All FIRs)
-        # ========================================
+            # ========================================
+            # GENERAL SETTINGS (All FIRs)
+            # ========================================
 
-        # Set VCCS Mini position for all profiles
-        self.update_all_profiles(
-            base_dir, {"TsVccsMiniControlX": "2421", "TsVccsMiniControlY": "26"}
-        )
+            # Set VCCS Mini position for all profiles
+            self.update_all_profiles(
+                base_dir, {"TsVccsMiniControlX": "2421", "TsVccsMiniControlY": "26"}
+            )
 
-        # Special VCCS position for TWR profiles
-        self.update_profiles(base_dir, "*TWR*.prf", {"TsVccsMiniControlX": "2361"})
+            # Special VCCS position for TWR profiles
+            self.update_profiles(base_dir, "*TWR*.prf", {"TsVccsMiniControlX": "2361"})
 
-        # ========================================
-        # FIR-SPECIFIC SETTINGS
-        # ========================================
+            # ========================================
+            # FIR-SPECIFIC SETTINGS
+            # ========================================
 
-        if fir_code == "EDGG":
-            self._apply_edgg_settings(base_dir)
-        elif fir_code == "EDMM":
-            self._apply_edmm_settings(base_dir)
-        elif fir_code == "EDWW":
-            self._apply_edww_settings(base_dir)
-        elif fir_code == "EDXX":
-            self._apply_edxx_settings(base_dir)
-        elif fir_code == "EXCXO":
-            self._apply_excxo_settings(base_dir)
+            handler = self._fir_dispatch.get(fir_code)
+            if handler:
+                handler(base_dir)
+        finally:
+            # Write what was staged even when a helper failed, as the helpers
+            # did when every call wrote its own files
+            try:
+                self._flush_staged()
+            finally:
+                self._staged = None
+                self._profile_cache = None
+
+                messages, self._messages = self._messages, None
+                if messages:
+                    sys.stdout.write("\n".join(messages) + "\n")
 
         print(f"   ✓ Applied custom settings for {fir_code}")
 
@@ -79,15 +238,18 @@ class CustomSettings:
         )
 
         # ===== EDGG Plugin Settings - Hide Traffic Management Lists =====
-        self.replace_in_file(
-            base_dir / "EDGG/Settings/EDGG/EDGG_Plugins.txt",
-            r"TopSky plugin:ACList/Traffic Management List 1/m_Visible:1",
-            "TopSky plugin:ACList/Traffic Management List 1/m_Visible:0",
-        )
-        self.replace_in_file(
+        self.replace_many_in_file(
             base_dir / "EDGG/Settings/EDGG/EDGG_Plugins.txt",
-            r"TopSky plugin:ACList/Traffic Management List 2/m_Visible:1",
-            "TopSky plugin:ACList/Traffic Management List 2/m_Visible:0",
+            [
+                (
+                    r"TopSky plugin:ACList/Traffic Management List 1/m_Visible:1",
+                    "TopSky plugin:ACList/Traffic Management List 1/m_Visible:0",
+                ),
+                (
+                    r"TopSky plugin:ACList/Traffic Management List 2/m_Visible:1",
+                    "TopSky plugin:ACList/Traffic Management List 2/m_Visible:0",
+                ),
+            ],
         )
 
         # ===== EDUU Screen Settings =====
@@ -146,25 +308,26 @@ class CustomSettings:
         )
 
         # ===== Traffic Management List Positions =====
-        self.replace_in_file(
-            base_dir / "EDGG/Settings/EDGG/EDGG_Plugins.txt",
-            r"Traffic Management List 1/m_X:\d+",
-            "Traffic Management List 1/m_X:0",
-        )
-        self.replace_in_file(
-            base_dir / "EDGG/Settings/EDGG/EDGG_Plugins.txt",
-            r"Traffic Management List 1/m_Y:\d+",
-            "Traffic Management List 1/m_Y:1005",
-        )
-        self.replace_in_file(
+        self.replace_many_in_file(
             base_dir / "EDGG/Settings/EDGG/EDGG_Plugins.txt",
-            r"Traffic Management List 2/m_X:\d+",
-            "Traffic Management List 2/m_X:368",
-        )
-        self.replace_in_file(
-            base_dir / "EDGG/Settings/EDGG/EDGG_Plugins.txt",
-            r"Traffic Management List 2/m_Y:\d+",
-            "Traffic Management List 2/m_Y:1005",
+            [
+                (
+                    r"Traffic Management List 1/m_X:\d+",
+                    "Traffic Management List 1/m_X:0",
+                ),
+                (
+                    r"Traffic Management List 1/m_Y:\d+",
+                    "Traffic Management List 1/m_Y:1005",
+                ),
+                (
+                    r"Traffic Management List 2/m_X:\d+",
+                    "Traffic Management List 2/m_X:368",
+                ),
+                (
+                    r"Traffic Management List 2/m_Y:\d+",
+                    "Traffic Management List 2/m_Y:1005",
+                ),
+            ],
         )
 
         # ===== General Settings - Set active airports by sectors =====
@@ -180,132 +343,80 @@ class CustomSettings:
             [(r"&atistype=.{3}&", "&"), (r"&depfreq=", "&atistype=&depfreq=")],
         )
 
-        self.replace_in_file(
-            base_dir / "EDGG/Settings/EDGG/EDGG_General.txt", r"&atistype=.{3}&", "&"
-        )
-        self.replace_in_file(
+        self.replace_many_in_file(
             base_dir / "EDGG/Settings/EDGG/EDGG_General.txt",
-            r"&depfreq=",
-            "&atistype=&depfreq=",
+            [(r"&atistype=.{3}&", "&"), (r"&depfreq=", "&atistype=&depfreq=")],
         )
 
         # ===== GRP Plugin Settings =====
         grp_maps_file = base_dir / "EDGG/Plugins/GRP/TWR_PHX_NIGHT/GRpluginMaps.txt"
-        if grp_maps_file.exists():
-            try:
-                with open(grp_maps_file, "r", encoding="iso-8859-1") as f:
-                    content = f.read()
-
-                # Disable Leadin Lines for EDDL
-                content = re.sub(
-                    r"(MAP:Leadin Lines\s+AIRPORT:EDDL\s+FOLDER:Airport Layout\s+COLOR:layout-taxiline-yellow)\s*(\n//)",
-                    r"\1\nACTIVE:0\2",
-                    content,
-                    flags=re.MULTILINE,
-                )
-
-                # Disable Aircraft Icons for EDDL
-                content = re.sub(
-                    r"(MAP:Aircraft Outlines\s+AIRPORT:EDDL\s+FOLDER:Apron Info\s+ACTIVE:)1",
-                    r"\g<1>0",
-                    content,
-                    flags=re.MULTILINE,
-                )
+        try:
+            content = original = self._read_bytes(grp_maps_file)
 
-                # Disable Checkpoint labels for EDDL
-                content = re.sub(
-                    r"(MAP:Checkpoints\s+AIRPORT:EDDL\s+FOLDER:Labels\s+ACTIVE:)1",
-                    r"\g<1>0",
-                    content,
-                    flags=re.MULTILINE,
-                )
+            # Disable Leadin Lines for EDDL
+            content = _EDDL_LEADIN_RE.sub(rb"\1\2ACTIVE:0\2\3", content)
 
-                # Disable EDDL Stand labels
-                content = re.sub(
-                    r"(MAP:Stands\s+AIRPORT:EDDL\s+FOLDER:Labels\s+ACTIVE:)1",
-                    r"\g<1>0",
-                    content,
-                    flags=re.MULTILINE,
-                )
+            # Disable Aircraft Icons, Checkpoint, Stand and Area labels for EDDL
+            content = _EDDL_ACTIVE_MAPS_RE.sub(rb"\g<1>0", content)
 
-                # Disable EDDL Area labels
-                content = re.sub(
-                    r"(MAP:Areas\s+AIRPORT:EDDL\s+FOLDER:Labels\s+ACTIVE:)1",
-                    r"\g<1>0",
-                    content,
-                    flags=re.MULTILINE,
+            if content != original:
+                self._write_bytes(grp_maps_file, content)
+                self._report(
+                    f"      ✓ Updated GRP plugin maps - disabled EDDL features"
                 )
 
-                with open(grp_maps_file, "w", encoding="iso-8859-1") as f:
-                    f.write(content)
-
-                print(f"      ✓ Updated GRP plugin maps - disabled EDDL features")
-
-            except Exception as e:
-                print(f"      ⚠️  Error updating GRP plugin maps: {e}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._report(f"      ⚠️  Error updating GRP plugin maps: {e}")
 
         # ===== TopSky Maps - Add ACTIVE runway conditions for EDDL downwind patterns =====
         topsky_maps_file = base_dir / "EDGG/Plugins/Topsky/EDGG/TopSkyMaps.txt"
-        if topsky_maps_file.exists():
-            try:
-                with open(topsky_maps_file, "r", encoding="iso-8859-1") as f:
-                    content = f.read()
-
-                content = re.sub(
-                    r"(MAP:DOWNWIND 05\s+COLOR:standard\s+FOLDER:EDDL\s+)(ZOOM:)",
-                    r"\1ACTIVE:RWY:ARR:EDDL05L:DEP:*\nACTIVE:RWY:ARR:EDDL05R:DEP:*\n\2",
-                    content,
-                    flags=re.MULTILINE,
-                )
-
-                content = re.sub(
-                    r"(MAP:DOWNWIND 23\s+COLOR:standard\s+FOLDER:EDDL\s+)(ZOOM:)",
-                    r"\1ACTIVE:RWY:ARR:EDDL23R:DEP:*\nACTIVE:RWY:ARR:EDDL23L:DEP:*\n\2",
-                    content,
-                    flags=re.MULTILINE,
+        try:
+            content = original = self._read_bytes(topsky_maps_file)
+            # Insert the new lines with the line endings the file already uses
+            newline = b"\r\n" if b"\r\n" in content else b"\n"
+
+            def add_runway_conditions(match):
+                conditions = b"".join(
+                    b"ACTIVE:RWY:ARR:EDDL" + runway + b":DEP:*" + newline
+                    for runway in _EDDL_DOWNWIND_RUNWAYS[match.group(2)]
                 )
+                return match.group(1) + conditions + match.group(3)
 
-                with open(topsky_maps_file, "w", encoding="iso-8859-1") as f:
-                    f.write(content)
+            content = _EDDL_DOWNWIND_RE.sub(add_runway_conditions, content)
 
-                print(
+            if content != original:
+                self._write_bytes(topsky_maps_file, content)
+                self._report(
                     f"      ✓ Updated TopSky maps - added ACTIVE runway conditions for EDDL downwind patterns"
                 )
 
-            except Exception as e:
-                print(f"      ⚠️  Error updating Langen TopSky maps: {e}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._report(f"      ⚠️  Error updating Langen TopSky maps: {e}")
 
         topsky_maps_file = base_dir / "EDGG/Plugins/Topsky/TWR_PHX_NIGHT/TopSkyMaps.txt"
-        if topsky_maps_file.exists():
-            try:
-                with open(topsky_maps_file, "r", encoding="iso-8859-1") as f:
-                    content = f.read()
-
-                # remove urban area from all tower profiles
-                content = re.sub(
-                    r"(MAP:Urban Area\s+FOLDER:Topography\s+ASRDATA:PHOENIX\s+LAYER:-4\s+)ACTIVE:ID:\*:DFC,DFGW,DFGC,DFGE,DFGI,DFG,DFTC,DFTS,DFTN,DFTW,DFAN,DFAS,DFANT,DFAST:\*:\*\s+AND_ACTIVE:ID:\*:DLC,DLGE,DLGW,DLT,DLA,DLAT,DLD,BOT:\*:\*\s+AND_ACTIVE:ID:\*:DKC,DKG,DKT,DKA,DKAT,NOR:\*:\*(\s+COLOR:)",
-                    r"\1ACTIVE:0\2",
-                    content,
-                    flags=re.MULTILINE,
-                )
+        try:
+            content = original = self._read_bytes(topsky_maps_file)
 
-                # remove highway from all tower profiles
-                content = re.sub(
-                    r"(MAP:Highways\s+FOLDER:Topography\s+ASRDATA:PHOENIX\s+LAYER:-2\s+COLOR:topo_road\s+STYLE:Solid:1\s+)ACTIVE:ID:\*:DFC,DFGW,DFGC,DFGE,DFGI,DFG,DFTC,DFTS,DFTN,DFTW,DFAN,DFAS,DFANT,DFAST:\*:\*\s+AND_ACTIVE:ID:\*:DLC,DLGE,DLGW,DLT,DLA,DLAT,DLD,BOT:\*:\*\s+AND_ACTIVE:ID:\*:DKC,DKG,DKT,DKA,DKAT,NOR:\*:\*(\s+COORD:)",
-                    r"\1ACTIVE:0\2",
-                    content,
-                    flags=re.MULTILINE,
-                )
+            # remove urban area from all tower profiles
+            content = _PHX_URBAN_AREA_RE.sub(rb"\1ACTIVE:0\2", content)
 
-                with open(topsky_maps_file, "w", encoding="iso-8859-1") as f:
-                    f.write(content)
+            # remove highway from all tower profiles
+            content = _PHX_HIGHWAYS_RE.sub(rb"\1ACTIVE:0\2", content)
 
-                print(
+            if content != original:
+                self._write_bytes(topsky_maps_file, content)
+                self._report(
                     f"      ✓ Updated TopSky maps for TWR PHX - removed urban area and highway"
                 )
 
-            except Exception as e:
-                print(f"      ⚠️  Error updating TWR TopSky maps: {e}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self._report(f"      ⚠️  Error updating TWR TopSky maps: {e}")
 
     def _apply_edmm_settings(self, base_dir: Path):
         """EDMM-specific settings - modify as you like!"""
@@ -348,15 +459,17 @@ class CustomSettings:
             "EDWW/Settings/Settings PHX/SCREEN.txt",
         ]
 
+        # Same updates for every screen file, so prepare them only once
+        screen_updates = self._compile_updates(
+            {
+                "m_ScreenNumber": "0",
+                "m_ScreenPosition": "0",
+                "m_ScreenMaximized": "0",
+            }
+        )
+
         for screen_file in screen_files:
-            self.update_file(
-                base_dir / screen_file,
-                {
-                    "m_ScreenNumber": "0",
-                    "m_ScreenPosition": "0",
-                    "m_ScreenMaximized": "0",
-                },
-            )
+            self._apply_compiled(base_dir / screen_file, screen_updates)
 
         # Additional EDWW-specific settings
         self.update_file(
@@ -446,25 +559,7 @@ class CustomSettings:
                 'm_MetarListX': '1500'
             })
         """
-        if not file_path.exists():
-            return
-
-        try:
-            with open(file_path, "r", encoding="iso-8859-1") as f:
-                content = f.read()
-
-            for setting, value in updates.items():
-                pattern = rf"^{re.escape(setting)}{re.escape(delimiter)}.+$"
-                replacement = f"{setting}{delimiter}{value}"
-                content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-
-            with open(file_path, "w", encoding="iso-8859-1") as f:
-                f.write(content)
-
-            print(f"      ✓ Updated {len(updates)} settings in {file_path.name}")
-
-        except Exception as e:
-            print(f"      ⚠️  Error updating {file_path.name}: {e}")
+        self._apply_compiled(file_path, self._compile_updates(updates, delimiter))
 
     def update_profiles(self, base_dir: Path, pattern: str, updates: Dict[str, str]):
         """
@@ -480,16 +575,30 @@ class CustomSettings:
                 'TsVccsMiniControlX': '1327'
             })
         """
-        files_updated = 0
-        for prf_file in base_dir.rglob(pattern):
-            for setting, value in updates.items():
-                self.replace_in_file(
-                    prf_file, rf"{re.escape(setting)}\t.+", f"{setting}\t{value}"
+        values = {
+            setting.encode("iso-8859-1"): value.encode("iso-8859-1")
+            for setting, value in updates.items()
+        }
+
+        # One alternation pass per file instead of one pass per setting
+        subs = []
+        if values:
+            settings_re = _compile_pattern(
+                rb"(" + rb"|".join(map(re.escape, values)) + rb")\t[^\r\n]+"
+            )
+            subs.append(
+                (
+                    settings_re,
+                    lambda match: match.group(1) + b"\t" + values[match.group(1)],
                 )
-            files_updated += 1
+            )
+
+        prf_files = self._find_profiles(base_dir, pattern)
+        self._apply_many_to_files(prf_files, subs)
+        files_updated = len(prf_files)
 
         if files_updated > 0:
-            print(
+            self._report(
                 f"      ✓ Updated {len(updates)} settings in {files_updated} profile files"
             )
 
@@ -514,14 +623,16 @@ class CustomSettings:
                 (r'&depfreq=', '&atistype=&depfreq=')
             ])
         """
-        files_updated = 0
-        for prf_file in base_dir.rglob(pattern):
-            for regex_pattern, replacement in replacements:
-                self.replace_in_file(prf_file, regex_pattern, replacement)
-            files_updated += 1
+        subs = self._compile_replacements(replacements, f"{pattern} profiles")
+        if subs is None:
+            return
+
+        prf_files = self._find_profiles(base_dir, pattern)
+        self._apply_many_to_files(prf_files, subs)
+        files_updated = len(prf_files)
 
         if files_updated > 0:
-            print(
+            self._report(
                 f"      ✓ Applied {len(replacements)} replacements to {files_updated} profile files"
             )
 
@@ -536,22 +647,31 @@ class CustomSettings:
 
         Example:
             self.replace_in_file(my_file, r'old_text', 'new_text')
-        """
-        if not file_path.exists():
-            return
 
-        try:
-            with open(file_path, "r", encoding="iso-8859-1") as f:
-                content = f.read()
+        The pattern sees the file like one opened in text mode: \\w and \\b
+        match accented letters and line endings are read as \\n.
+        """
+        self.replace_many_in_file(file_path, [(pattern, replacement)])
 
-            new_content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
+    def replace_many_in_file(
+        self, file_path: Path, replacements: List[Tuple[str, str]]
+    ):
+        """
+        Apply several regex replacements to one file in a single read and write
 
-            if new_content != content:
-                with open(file_path, "w", encoding="iso-8859-1") as f:
-                    f.write(new_content)
+        Args:
+            file_path: Path to the file
+            replacements: List of (regex_pattern, replacement) tuples
 
-        except Exception as e:
-            print(f"      ⚠️  Error updating {file_path.name}: {e}")
+        Example:
+            self.replace_many_in_file(my_file, [
+                (r'old_text', 'new_text'),
+                (r'other_text', 'more_text')
+            ])
+        """
+        subs = self._compile_replacements(replacements, file_path.name)
+        if subs is not None:
+            self._apply_many(file_path, subs)
 
     def add_lines_to_file(self, file_path: Path, lines_to_add):
         """
@@ -565,33 +685,204 @@ class CustomSettings:
         if not file_path.exists():
             return
 
+        self._flush_staged(file_path)
+
         try:
             with open(file_path, "a", encoding="iso-8859-1") as f:
                 f.write("\n")
                 for line in lines_to_add:
                     f.write(line + "\n")
 
-            print(f"      ✓ Added {len(lines_to_add)} lines in {file_path.name}")
+            self._report(f"      ✓ Added {len(lines_to_add)} lines in {file_path.name}")
 
         except Exception as e:
-            print(f"      ⚠️  Error updating {file_path.name}: {e}")
+            self._report(f"      ⚠️  Error updating {file_path.name}: {e}")
 
     def copy_file(self, source: Path, target: Path):
         """Copy a file - useful for custom file operations"""
-        try:
-            import shutil
+        self._flush_staged(source)
+        self._flush_staged(target)
 
+        try:
             shutil.copy2(source, target)
-            print(f"      ✓ Copied {source.name} to {target}")
+            self._report(f"      ✓ Copied {source.name} to {target}")
         except Exception as e:
-            print(f"      ⚠️  Error copying {source.name}: {e}")
+            self._report(f"      ⚠️  Error copying {source.name}: {e}")
+
+    def _compile_updates(
+        self, updates: Dict[str, str], delimiter: str = ":"
+    ) -> Tuple[Dict[bytes, bytes], bytes]:
+        """Prepare settings updates once so they can be applied to many files"""
+        # Settings files are iso-8859-1, so work on the raw bytes directly
+        delimiter_bytes = delimiter.encode("iso-8859-1")
+        updates_bytes = {
+            setting.encode("iso-8859-1"): value.encode("iso-8859-1")
+            for setting, value in updates.items()
+        }
+
+        return updates_bytes, delimiter_bytes
+
+    def _apply_compiled(
+        self,
+        file_path: Path,
+        compiled: Tuple[Dict[bytes, bytes], bytes],
+    ):
+        """Apply updates prepared by _compile_updates to a settings file"""
+        updates_bytes, delimiter_bytes = compiled
 
-    def _get_base_dir(self, package_info: Dict[str, str]) -> Path:
+        try:
+            content = self._read_bytes(file_path)
+
+            # A substring check is much cheaper than splitting the whole file
+            if not any(setting in content for setting in updates_bytes):
+                return
+
+            new_content = _rewrite_settings(content, updates_bytes, delimiter_bytes)
+
+            if new_content == content:
+                return
+
+            self._write_bytes(file_path, new_content)
+
+            self._report(
+                f"      ✓ Updated {len(updates_bytes)} settings in {file_path.name}"
+            )
+
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self._report(f"      ⚠️  Error updating {file_path.name}: {e}")
+
+    def _compile_replacements(
+        self, replacements: List[Tuple[str, str]], target_name: str
+    ) -> Optional[List[Tuple[Union["re.Pattern", bytes], Union[str, bytes]]]]:
+        """Compile user replacements, reporting a bad pattern instead of raising"""
+        try:
+            return [
+                self._compile_replacement(regex_pattern, replacement)
+                for regex_pattern, replacement in replacements
+            ]
+        except (re.error, UnicodeEncodeError) as e:
+            self._report(f"      ⚠️  Error updating {target_name}: {e}")
+            return None
+
+    def _compile_replacement(
+        self, pattern: str, replacement: str
+    ) -> Tuple[Union["re.Pattern", bytes], Union[str, bytes]]:
+        """Compile a text regex and replacement for use on iso-8859-1 files"""
+        # Plain text needs no regex engine; returned as bytes for bytes.replace
+        if _REGEX_METACHARACTERS.isdisjoint(pattern) and not (
+            "\\" in replacement or "\n" in replacement
+        ):
+            return pattern.encode("iso-8859-1"), replacement.encode("iso-8859-1")
+
+        # Kept as str so \w, \b and case folding cover accented letters
+        return _compile_pattern(pattern), replacement
+
+    def _apply_many_to_files(
+        self, file_paths: List[Path], subs: List[Tuple["re.Pattern", bytes]]
+    ):
+        """Apply the same substitutions to many files, in parallel for larger sets"""
+        for_each(lambda file_path: self._apply_many(file_path, subs), file_paths)
+
+    def _apply_many(self, file_path: Path, subs: List[Tuple["re.Pattern", bytes]]):
+        """Apply compiled (pattern, replacement) pairs with one read and one write"""
+        try:
+            content = self._read_bytes(file_path)
+
+            new_content = content
+            for compiled, replacement in subs:
+                if isinstance(compiled, bytes):
+                    new_content = new_content.replace(compiled, replacement)
+                elif isinstance(compiled.pattern, str):
+                    new_content = _sub_text(compiled, replacement, new_content)
+                else:
+                    new_content = compiled.sub(replacement, new_content)
+
+            if new_content != content:
+                self._write_bytes(file_path, new_content)
+
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self._report(f"      ⚠️  Error updating {file_path.name}: {e}")
+
+    def _report(self, message: str):
+        """Print a progress message, or buffer it while apply_all_settings is running"""
+        if self._messages is not None:
+            self._messages.append(message)
+        else:
+            print(message)
+
+    def _read_bytes(self, file_path: Path) -> bytes:
+        """Read a file, preferring contents that are staged but not yet written"""
+        if self._staged is not None and file_path in self._staged:
+            return self._staged[file_path]
+
+        with open(file_path, "rb") as f:
+            return f.read()
+
+    def _write_bytes(self, file_path: Path, content: bytes):
+        """Write a file, or stage it while apply_all_settings is running"""
+        if self._staged is not None:
+            self._staged[file_path] = content
+            return
+
+        with open(file_path, "wb") as f:
+            f.write(content)
+
+    def _flush_staged(self, file_path: Optional[Path] = None):
+        """Write staged contents to disk - all of them, or only file_path"""
+        if not self._staged:
+            return
+
+        if file_path is None:
+            pending = list(self._staged.items())
+            self._staged.clear()
+        elif file_path in self._staged:
+            pending = [(file_path, self._staged.pop(file_path))]
+        else:
+            return
+
+        # Files are independent, so overlap their writes
+        for_each(self._write_staged, pending)
+
+    def _write_staged(self, staged: Tuple[Path, bytes]):
+        """Write one staged (file_path, content) pair to disk"""
+        staged_path, content = staged
+        try:
+            with open(staged_path, "wb") as f:
+                f.write(content)
+        except Exception as e:
+            self._report(f"      ⚠️  Error writing {staged_path.name}: {e}")
+
+    def _find_profiles(self, base_dir: Path, pattern: str) -> List[Path]:
+        """Find profile files matching pattern, using the cached walk if available"""
+        matches = _name_matcher(pattern)
+
+        if (
+            self._profile_cache is not None
+            and self._profile_cache[0] == base_dir
+            and pattern.endswith(".prf")
+        ):
+            return [
+                prf_file
+                for prf_file in self._profile_cache[1]
+                if matches(prf_file.name)
+            ]
+
+        return [
+            Path(file_path)
+            for file_path in _iter_files(base_dir, skip_dirs=PROFILE_WALK_SKIP_DIRS)
+            if matches(os.path.basename(file_path))
+        ]
+
+    def _get_base_dir(self, fir_code: str) -> Path:
         """Get base directory for the package"""
         base_dir = self.config.euroscope_docs
 
         if self.config.use_subdirs:
-            base_dir = base_dir / package_info["fir"]
+            base_dir = base_dir / fir_code
 
         return base_dir
 
@@ -603,7 +894,7 @@ class CustomSettings:
 To add custom settings for a new FIR or modify existing ones:
 
 1. Add a new method like _apply_myfir_settings(self, base_dir)
-2. Call it from apply_all_settings() 
+2. Register it in self._fir_dispatch in __init__()
 3. Use the helper methods to make changes
 
 Example for a new FIR:
@@ -630,9 +921,11 @@ def _apply_myfir_settings(self, base_dir: Path):
     if custom_file.exists():
         self.copy_file(custom_file, base_dir / "MYFIR/MyFile.txt")
 
-Then add to apply_all_settings():
-elif fir_code == 'MYFIR':
-    self._apply_myfir_settings(base_dir)
+Then register it in __init__():
+self._fir_dispatch = {
+    ...
+    'MYFIR': self._apply_myfir_settings,
+}
 
 HELPER METHODS SUMMARY:
 
@@ -656,6 +949,10 @@ replace_in_file(file_path, pattern, replacement)
     - Apply regex replacement to any file
     - e.g., replace_in_file(my_file, r'pattern', 'replacement')
 
+replace_many_in_file(file_path, replacements)
+    - Apply several regex replacements to one file in one pass
+    - e.g., replace_many_in_file(my_file, [('old', 'new'), ('foo', 'bar')])
+
 copy_file(source, target)
     - Copy files around
     - e.g., copy_file(custom_file, target_location)
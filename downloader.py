@@ -1,44 +1,134 @@
+import html
+import itertools
+import os
 import re
-import requests
+import time
+import zipfile
 from pathlib import Path
 from typing import Dict, Optional
-from bs4 import BeautifulSoup
+
+# Bytes read from the response per write; packages are tens of MB
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Minimum seconds between two progress updates while downloading
+PROGRESS_INTERVAL = 0.1
+
+# href of an <a> tag, double-, single- or unquoted; not data-href and the like.
+# Quoted attribute values are skipped whole so an href= inside them is ignored
+_HREF_RE = re.compile(
+    r"""<a\s(?:[^>"']|"[^"]*"|'[^']*')*?(?<![-\w])href\s*=\s*"""
+    r"""(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""",
+    re.IGNORECASE,
+)
+
+# Comments and script/style bodies, whose links an HTML parser would not report
+_NON_MARKUP_RE = re.compile(
+    r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>", re.DOTALL | re.IGNORECASE
+)
+
+# Charset declared in a <meta> tag of an HTML page
+_META_CHARSET_RE = re.compile(
+    rb"""<meta\s[^>]*?charset\s*=\s*["']?([-\w.:]+)""", re.IGNORECASE
+)
+
+# Package file name formats, most specific first
+_PACKAGE_INFO_PATTERNS = [
+    re.compile(r"^([A-Z]{4,5})-.*?(\d{8})-(\d{6})-(\d+).*$"),
+    re.compile(r"^([A-Z]{4,5})-.*?(\d{8})-(\d{6}).*$"),
+    re.compile(r"^([A-Z]{4,5}).*?(\d{4}).*$"),
+]
+
+# Date, AIRAC and optional version parts of the first two formats above
+_VERSIONED_DATE_RE = re.compile(r"(\d{8})-(\d{6})-(\d+)")
+_DATE_RE = re.compile(r"(\d{8})-(\d{6})")
+
+# Four-digit AIRAC guess; 2024/2025 are years and are consumed without a capture
+_AIRAC_RE = re.compile(r"202[45]|(2\d{3})")
+
+# FIR code -> index page to search and pattern of the package link on it
+DOWNLOAD_RULES = {
+    "BIRD": {
+        "url": "https://files.aero-nav.com/SCA",
+        "pattern": re.compile(
+            r"https://files\.aero-nav\.com/BIRD/Install-Pack_.*\.zip"
+        ),
+    },
+    "EDGG": {
+        "url": "https://files.aero-nav.com/EDXX",
+        "pattern": re.compile(
+            r"https://files\.aero-nav\.com/EDGG/.*Full.*Package.*\.zip"
+        ),
+    },
+    "EDMM": {
+        "url": "https://files.aero-nav.com/EDXX",
+        "pattern": re.compile(
+            r"https://files\.aero-nav\.com/EDMM/.*Full.*Package.*\.zip"
+        ),
+    },
+    "EDWW": {
+        "url": "https://files.aero-nav.com/EDXX",
+        "pattern": re.compile(
+            r"https://files\.aero-nav\.com/EDWW/.*Full.*Package.*\.zip"
+        ),
+    },
+    "EDXX": {
+        "url": "https://files.aero-nav.com/EDXX",
+        "pattern": re.compile(r"https://files\.aero-nav\.com/EDXX/FIS_.*\.zip"),
+    },
+    "EXCXO": {
+        "url": "https://files.aero-nav.com/EXCXO",
+        "pattern": re.compile(
+            r"https://files\.aero-nav\.com/EXCXO/EXCXO-Install_.*\.zip"
+        ),
+    },
+    "LPPO": {
+        "url": "https://files.aero-nav.com/LPPO",
+        "pattern": re.compile(
+            r"https://files\.aero-nav\.com/LPPO/Install-Package_.*\.zip"
+        ),
+    },
+}
+
+
+def _decode_page(content: bytes) -> str:
+    """Decode an HTML page from its BOM or <meta> charset, else UTF-8, else cp1252"""
+    if content.startswith(b"\xef\xbb\xbf"):
+        return content[3:].decode("utf-8", errors="replace")
+
+    encodings = ["utf-8", "cp1252"]
+    match = _META_CHARSET_RE.search(content)
+    if match:
+        encodings.insert(0, match.group(1).decode("ascii"))
+
+    for encoding in encodings:
+        try:
+            return content.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+
+    return content.decode("cp1252", errors="replace")
+
+
+def _find_package_url(content: bytes, pattern: "re.Pattern") -> Optional[str]:
+    """First <a href> of an index page that matches pattern"""
+    index_page = _NON_MARKUP_RE.sub("", _decode_page(content))
+
+    # Only the link targets are needed, so skip building an HTML tree and
+    # stop at the first link that matches
+    for match in _HREF_RE.finditer(index_page):
+        href = html.unescape("".join(filter(None, match.groups())))
+        if pattern.match(href):
+            return href
+
+    return None
 
 
 class PackageDownloader:
     def __init__(self, config):
         self.config = config
         self.current_download_fir = None
-        self.download_rules = {
-            "BIRD": {
-                "url": "https://files.aero-nav.com/SCA",
-                "pattern": r"https://files\.aero-nav\.com/BIRD/Install-Pack_.*\.zip",
-            },
-            "EDGG": {
-                "url": "https://files.aero-nav.com/EDXX",
-                "pattern": r"https://files\.aero-nav\.com/EDGG/.*Full.*Package.*\.zip",
-            },
-            "EDMM": {
-                "url": "https://files.aero-nav.com/EDXX",
-                "pattern": r"https://files\.aero-nav\.com/EDMM/.*Full.*Package.*\.zip",
-            },
-            "EDWW": {
-                "url": "https://files.aero-nav.com/EDXX",
-                "pattern": r"https://files\.aero-nav\.com/EDWW/.*Full.*Package.*\.zip",
-            },
-            "EDXX": {
-                "url": "https://files.aero-nav.com/EDXX",
-                "pattern": r"https://files\.aero-nav\.com/EDXX/FIS_.*\.zip",
-            },
-            "EXCXO": {
-                "url": "https://files.aero-nav.com/EXCXO",
-                "pattern": r"https://files\.aero-nav\.com/EXCXO/EXCXO-Install_.*\.zip",
-            },
-            "LPPO": {
-                "url": "https://files.aero-nav.com/LPPO",
-                "pattern": r"https://files\.aero-nav\.com/LPPO/Install-Package_.*\.zip",
-            },
-        }
+        self._session: Optional["requests.Session"] = None
+        self.download_rules = DOWNLOAD_RULES
 
     def get_package(self, package_input: str) -> Path:
         if (
@@ -66,33 +156,13 @@ class PackageDownloader:
 
         print(f"🔍 Finding latest {fir_code} package...")
 
-        session = requests.Session()
-
-        session.headers.update(
-            {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                "Accept-Language": "en-US,en;q=0.5",
-                "Accept-Encoding": "gzip, deflate",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-            }
-        )
+        session = self._get_session()
 
-        print(f"   Accessing {rule['url']}...")
+        self._debug(f"   Accessing {rule['url']}...")
         response = session.get(rule["url"], headers={"Referer": rule["url"]})
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, "html.parser")
-        links = soup.find_all("a", href=True)
-
-        package_url = None
-        for link in links:
-            href = link.get("href", "")
-            if re.match(rule["pattern"], href):
-                package_url = href
-                break
-
+        package_url = _find_package_url(response.content, rule["pattern"])
         if not package_url:
             raise ValueError(f"Could not find download link for {fir_code}")
 
@@ -103,15 +173,15 @@ class PackageDownloader:
         target_path = self._get_unique_filepath(self.config.download_dir / filename)
 
         print(f"📥 Downloading {filename}...")
-        print(f"   URL: {package_url}")
-        print(f"   Target: {target_path}")
+        self._debug(f"   URL: {package_url}")
+        self._debug(f"   Target: {target_path}")
 
         download_headers = {
             "Referer": rule["url"],
             "Accept": "application/zip,application/octet-stream,*/*",
         }
 
-        print(f"   Using session with referrer: {rule['url']}")
+        self._debug(f"   Using session with referrer: {rule['url']}")
         response = session.get(package_url, headers=download_headers, stream=True)
         response.raise_for_status()
 
@@ -128,18 +198,37 @@ class PackageDownloader:
 
         target_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Every ZIP starts with "PK", so a protection page is caught before
+        # anything is written, even when it isn't served as text/html
+        chunks = filter(None, response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE))
+        first_chunk = next(chunks, b"")
+        if not first_chunk.startswith(b"PK"):
+            raise ValueError(
+                f"Got non-ZIP data instead of the package - download link may be protected or expired"
+            )
+
         total_size = int(response.headers.get("content-length", 0))
         downloaded_size = 0
+        last_progress = 0.0
 
         with open(target_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
+            for chunk in itertools.chain([first_chunk], chunks):
                 if chunk:
                     f.write(chunk)
                     downloaded_size += len(chunk)
 
                     if total_size > 0:
-                        progress = (downloaded_size / total_size) * 100
-                        print(f"\r   Progress: {progress:.1f}%", end="", flush=True)
+                        # Console output is slow, so only refresh a few times a second
+                        now = time.monotonic()
+                        if (
+                            now - last_progress >= PROGRESS_INTERVAL
+                            or downloaded_size >= total_size
+                        ):
+                            last_progress = now
+                            progress = (downloaded_size / total_size) * 100
+                            print(
+                                f"\r   Progress: {progress:.1f}%", end="", flush=True
+                            )
 
         print(f"\n✓ Downloaded successfully")
 
@@ -149,10 +238,11 @@ class PackageDownloader:
             )
 
         try:
-            import zipfile
-
-            with zipfile.ZipFile(target_path, "r") as zip_test:
-                zip_test.testzip()
+            # Opening parses the central directory at the end of the file, which
+            # catches truncated or non-ZIP downloads; member CRCs are checked
+            # anyway when the package is extracted
+            with zipfile.ZipFile(target_path, "r"):
+                pass
             print(f"✓ ZIP file verification passed")
         except zipfile.BadZipFile:
             target_path.unlink()
@@ -162,6 +252,39 @@ class PackageDownloader:
 
         return target_path
 
+    def _debug(self, message: str):
+        """Print a diagnostic message when verbose output is enabled"""
+        if self.config.verbose:
+            print(message)
+
+    def _get_session(self) -> "requests.Session":
+        """Create the HTTP session on first use and keep it for later downloads"""
+        if self._session is not None:
+            return self._session
+
+        # Imported here so runs with a local package file don't pay for requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+
+        session.headers.update(
+            {
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.5",
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+                "Upgrade-Insecure-Requests": "1",
+            }
+        )
+
+        # Keep connections to the aero-nav hosts open between requests
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+        self._session = session
+        return session
+
     def _get_unique_filepath(self, filepath: Path) -> Path:
         if not filepath.exists():
             return filepath
@@ -170,11 +293,14 @@ class PackageDownloader:
         suffix = filepath.suffix
         parent = filepath.parent
 
+        # List the folder once instead of probing every candidate name
+        existing = {os.path.normcase(name) for name in os.listdir(parent)}
+
         counter = 2
         while True:
-            new_path = parent / f"{base}-{counter}{suffix}"
-            if not new_path.exists():
-                return new_path
+            new_name = f"{base}-{counter}{suffix}"
+            if os.path.normcase(new_name) not in existing:
+                return parent / new_name
             counter += 1
 
     def extract_package_info(self, package_path: Path) -> Dict[str, str]:
@@ -190,33 +316,40 @@ class PackageDownloader:
             "version": "",
         }
 
-        patterns = [
-            r"^([A-Z]{4,5})-.*?(\d{8})-(\d{6})-(\d+).*$",
-            r"^([A-Z]{4,5})-.*?(\d{8})-(\d{6}).*$",
-            r"^([A-Z]{4,5}).*?(\d{4}).*$",
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, filename)
-            if match:
-                groups = match.groups()
-
-                if len(groups) >= 4:
-                    package_info["fir"] = groups[0]
-                    airac_full = groups[2]
-                    package_info["airac"] = airac_full[:4]
-                    package_info["version"] = groups[3]
-
-                elif len(groups) >= 3:
-                    package_info["fir"] = groups[0]
-                    airac_full = groups[2]
-                    package_info["airac"] = airac_full[:4]
-
-                elif len(groups) >= 2:
-                    package_info["fir"] = groups[0]
-                    package_info["airac"] = groups[1]
+        date_match = None
+        if fir_context and filename.startswith(f"{fir_context}-"):
+            # Auto-downloaded files are "<FIR>-<original name>", so the FIR is
+            # already known and only the date part needs to be found
+            date_match = _VERSIONED_DATE_RE.search(filename) or _DATE_RE.search(
+                filename
+            )
 
-                break
+        if date_match:
+            package_info["airac"] = date_match.group(2)[:4]
+            if date_match.re is _VERSIONED_DATE_RE:
+                package_info["version"] = date_match.group(3)
+        else:
+            for pattern in _PACKAGE_INFO_PATTERNS:
+                match = pattern.match(filename)
+                if match:
+                    groups = match.groups()
+
+                    if len(groups) >= 4:
+                        package_info["fir"] = groups[0]
+                        airac_full = groups[2]
+                        package_info["airac"] = airac_full[:4]
+                        package_info["version"] = groups[3]
+
+                    elif len(groups) >= 3:
+                        package_info["fir"] = groups[0]
+                        airac_full = groups[2]
+                        package_info["airac"] = airac_full[:4]
+
+                    elif len(groups) >= 2:
+                        package_info["fir"] = groups[0]
+                        package_info["airac"] = groups[1]
+
+                    break
 
         if package_info["fir"] and package_info["fir"].startswith("EXCXO"):
             package_info["fir"] = "EXCXO"
@@ -225,12 +358,9 @@ class PackageDownloader:
             package_info["fir"] = fir_context
 
         if not package_info["airac"]:
-            airac_matches = re.findall(r"2\d{3}", filename)
-            if airac_matches:
-                for potential_airac in airac_matches:
-                    if potential_airac not in ["2024", "2025"]:
-                        package_info["airac"] = potential_airac
-                        break
+            package_info["airac"] = next(
+                (m.group(1) for m in _AIRAC_RE.finditer(filename) if m.group(1)), ""
+            )
 
         if not package_info["fir"]:
             raise ValueError(
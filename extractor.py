@@ -1,8 +1,110 @@
+import os
 import shutil
+import sys
+import threading
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from parallel import for_each
+
+# Every worker opens its own handle on the archive and reads its central
+# directory, so packages up to this many members are unpacked on one handle
+PARALLEL_EXTRACT_THRESHOLD = 32
+
+# FIR code -> profile file renames applied after extraction without subdirs
+_RENAME_RULES = {
+    "BIRD": {"BIRD_TopSky.prf": "BIRD FIR - OCA.prf"},
+    "EDMM": {
+        "iCAS2.prf": "EDMM FIR - Muenchen iCAS2.prf",
+        "TWR_PHX_DAY.prf": "EDMM FIR - TWR PHX Day.prf",
+        "TWR_PHX_NIGHT.prf": "EDMM FIR - TWR PHX Night.prf",
+    },
+    "EDXX": {"FIS.prf": "EDXX FIS.prf"},
+    "EXCXO": {"OCA TopSky.prf": "EXCXO FSS - OCA.prf"},
+    "LPPO": {"LPPO.prf": "LPPO FIR.prf", "LPPO_TS.prf": "LPPO FIR - OCA.prf"},
+}
+
+
+def _fastcopy(src: Union[str, Path], dst: Union[str, Path]):
+    """Copy a file with its metadata like shutil.copy2, in the kernel where possible"""
+    copied_all = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                # Size 0 may just be a file system that doesn't report it
+                copied_all = remaining > 0
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not copied:
+                        # Some file systems stop early (procfs, FUSE, cross-device)
+                        copied_all = False
+                        break
+                    remaining -= copied
+        except OSError:
+            copied_all = False
+
+    # Not supported for this file system pair or stopped short, so copy the whole
+    # file again the regular way; copyfile picks its own fastest path
+    if not copied_all:
+        shutil.copyfile(src, dst)
+
+    shutil.copystat(src, dst)
+
+
+def _copy_files(jobs: List[Tuple[str, str]]):
+    """Copy (source, target) pairs, on a thread pool for larger sets"""
+    for_each(lambda job: _fastcopy(*job), jobs)
+
+
+def _walk_tree(root: str) -> Iterator[Tuple[os.DirEntry, str]]:
+    """Yield (entry, path relative to root) for every file and folder below root"""
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        with os.scandir(os.path.join(root, rel_dir)) as entries:
+            for entry in entries:
+                rel_path = os.path.join(rel_dir, entry.name)
+                yield entry, rel_path
+                if entry.is_dir():
+                    stack.append(rel_path)
+
+
+def _prefixed_entries(directory: Path, prefix: str) -> List[os.DirEntry]:
+    """Entries of directory whose name starts with prefix, like glob(f"{prefix}*")"""
+    prefix = os.path.normcase(prefix)
+    try:
+        with os.scandir(directory) as entries:
+            return [
+                entry
+                for entry in entries
+                if os.path.normcase(entry.name).startswith(prefix)
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def _copy_tree(src: str, dst: Path):
+    """Copy the folder src to dst like shutil.copytree, copying files concurrently"""
+    os.makedirs(dst)
+
+    directories = [(src, dst)]
+    files = []
+    for entry, rel_path in _walk_tree(src):
+        target = os.path.join(dst, rel_path)
+        if entry.is_dir():
+            os.makedirs(target, exist_ok=True)
+            directories.append((entry.path, target))
+        else:
+            files.append((entry.path, target))
+
+    _copy_files(files)
+
+    # Copy folder timestamps last, writing the files would change them again
+    for source_dir, target_dir in directories:
+        shutil.copystat(source_dir, target_dir)
 
 
 class PackageExtractor:
@@ -21,20 +123,22 @@ class PackageExtractor:
         if self.config.use_subdirs:
             source_dir = self.config.euroscope_docs / fir_code
             if source_dir.exists():
-                shutil.copytree(source_dir, backup_target)
+                _copy_tree(str(source_dir), backup_target)
                 print(f"✓ Backed up {source_dir} to {backup_target}")
         else:
             backup_target.mkdir(exist_ok=True)
 
-            for item in self.config.euroscope_docs.glob(f"{fir_code}*"):
-                target_item = backup_target / item.name
+            entries = _prefixed_entries(self.config.euroscope_docs, fir_code)
+            for entry in entries:
+                target_item = backup_target / entry.name
 
-                if item.is_dir():
-                    shutil.copytree(item, target_item)
+                if entry.is_dir():
+                    _copy_tree(entry.path, target_item)
                 else:
-                    shutil.copy2(item, target_item)
+                    _fastcopy(entry.path, target_item)
 
-                print(f"✓ Backed up {item.name}")
+            self._print_verbose(f"   {entry.name}" for entry in entries)
+            print(f"✓ Backed up {len(entries)} items to {backup_target}")
 
     def extract_package(self, package_path: Path, package_info: Dict[str, str]):
         print("📦 Extracting package...")
@@ -49,12 +153,40 @@ class PackageExtractor:
         self._remove_existing_files(fir_code)
 
         with zipfile.ZipFile(package_path, "r") as zip_ref:
-            zip_ref.extractall(extraction_target)
+            self._extract_members(package_path, zip_ref, extraction_target)
 
         print(f"✓ Extracted to {extraction_target}")
 
         self._rename_profile_files(package_info, extraction_target)
 
+    def _extract_members(
+        self, package_path: Path, zip_ref: zipfile.ZipFile, target_dir: Path
+    ):
+        """Extract all members, on a thread pool with one handle per thread if many"""
+        local = threading.local()
+        # Extracting in a row runs on this thread and reuses the open archive
+        local.zip_file = zip_ref
+        handles = []
+
+        def extract(info):
+            zip_file = getattr(local, "zip_file", None)
+            if zip_file is None:
+                zip_file = local.zip_file = zipfile.ZipFile(package_path, "r")
+                handles.append(zip_file)
+
+            try:
+                zip_file.extract(info, target_dir)
+            except FileExistsError:
+                # Another worker created the same folder between ZipFile's
+                # exists check and makedirs; it is there now, so just retry
+                zip_file.extract(info, target_dir)
+
+        try:
+            for_each(extract, zip_ref.infolist(), PARALLEL_EXTRACT_THRESHOLD)
+        finally:
+            for zip_file in handles:
+                zip_file.close()
+
     def _remove_existing_files(self, fir_code: str):
         print(f"🗑️  Removing old {fir_code} files...")
 
@@ -63,11 +195,11 @@ class PackageExtractor:
             if target_dir.exists():
                 shutil.rmtree(target_dir)
         else:
-            for item in self.config.euroscope_docs.glob(f"{fir_code}*"):
-                if item.is_dir():
-                    shutil.rmtree(item)
+            for entry in _prefixed_entries(self.config.euroscope_docs, fir_code):
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
                 else:
-                    item.unlink()
+                    os.unlink(entry.path)
 
     def _rename_profile_files(
         self, package_info: Dict[str, str], extraction_target: Path
@@ -77,28 +209,28 @@ class PackageExtractor:
 
         fir_code = package_info["fir"]
 
-        rename_rules = {
-            "BIRD": {"BIRD_TopSky.prf": "BIRD FIR - OCA.prf"},
-            "EDMM": {
-                "iCAS2.prf": "EDMM FIR - Muenchen iCAS2.prf",
-                "TWR_PHX_DAY.prf": "EDMM FIR - TWR PHX Day.prf",
-                "TWR_PHX_NIGHT.prf": "EDMM FIR - TWR PHX Night.prf",
-            },
-            "EDXX": {"FIS.prf": "EDXX FIS.prf"},
-            "EXCXO": {"OCA TopSky.prf": "EXCXO FSS - OCA.prf"},
-            "LPPO": {"LPPO.prf": "LPPO FIR.prf", "LPPO_TS.prf": "LPPO FIR - OCA.prf"},
-        }
-
-        if fir_code in rename_rules:
+        if fir_code in _RENAME_RULES:
             print("🏷️  Renaming profile files...")
 
-            for old_name, new_name in rename_rules[fir_code].items():
-                old_file = extraction_target / old_name
-                new_file = extraction_target / new_name
-
-                if old_file.exists():
-                    old_file.rename(new_file)
-                    print(f"   {old_name} → {new_name}")
+            renamed = []
+            for old_name, new_name in _RENAME_RULES[fir_code].items():
+                # Renaming reports a missing file itself, no need to stat first
+                try:
+                    os.rename(
+                        extraction_target / old_name, extraction_target / new_name
+                    )
+                except FileNotFoundError:
+                    continue
+                renamed.append((old_name, new_name))
+
+            self._print_verbose(
+                f"   {old_name} → {new_name}" for old_name, new_name in renamed
+            )
+
+    def _print_verbose(self, lines: Iterable[str]):
+        """Print per-item detail lines in one write when verbose output is enabled"""
+        if self.config.verbose:
+            sys.stdout.write("".join(f"{line}\n" for line in lines))
 
     def copy_additional_files(self, package_info: Dict[str, str]):
         """Copy NavData and custom files"""
@@ -122,11 +254,12 @@ class PackageExtractor:
             return
 
         try:
-            with open(cycle_file, "r") as f:
-                content = f.read()
-                if "Valid" not in content:
-                    print("⚠️  NavData appears outdated, skipping copy")
-                    return
+            # The validity note is at the top, no need to read or decode the rest
+            with open(cycle_file, "rb") as f:
+                head = f.read(4096)
+            if b"Valid" not in head:
+                print("⚠️  NavData appears outdated, skipping copy")
+                return
         except Exception as e:
             print(f"⚠️  Could not validate NavData: {e}")
             return
@@ -148,7 +281,7 @@ class PackageExtractor:
                 target_file = navdata_target / filename.lower()
 
                 if source_file.exists():
-                    shutil.copy2(source_file, target_file)
+                    _fastcopy(source_file, target_file)
                     print(f"   ✓ {filename}")
 
     def _copy_custom_files(self, package_info: Dict[str, str]):
@@ -166,12 +299,17 @@ class PackageExtractor:
         if self.config.use_subdirs:
             target_dir = target_dir / package_info["fir"]
 
-        for item in custom_dir.rglob("*"):
-            if item.is_file():
-                relative_path = item.relative_to(custom_dir)
-                target_path = target_dir / relative_path
+        jobs = []
+        relative_paths = []
+        for entry, relative_path in _walk_tree(str(custom_dir)):
+            if entry.is_file():
+                jobs.append((entry.path, os.path.join(target_dir, relative_path)))
+                relative_paths.append(relative_path)
+
+        for directory in {os.path.dirname(target) for _, target in jobs}:
+            os.makedirs(directory, exist_ok=True)
 
-                target_path.parent.mkdir(parents=True, exist_ok=True)
+        _copy_files(jobs)
 
-                shutil.copy2(item, target_path)
-                print(f"   ✓ {relative_path}")
+        self._print_verbose(f"   ✓ {path}" for path in relative_paths)
+        print(f"   ✓ Copied {len(jobs)} files")
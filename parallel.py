@@ -0,0 +1,21 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Sequence
+
+# Profile edits, staged writes and file copies are a few KB to a few MB each;
+# up to this many are done in a row faster than a thread pool starts up
+PARALLEL_THRESHOLD = 8
+
+# The work is mostly file I/O, so use more threads than cores
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def for_each(
+    func: Callable, items: Sequence, threshold: int = PARALLEL_THRESHOLD
+) -> List:
+    """Call func on every item, on a thread pool above threshold, return the results"""
+    if len(items) <= threshold:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        return list(executor.map(func, items))
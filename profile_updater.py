@@ -1,12 +1,135 @@
-import csv
+import fnmatch
+import os
 import re
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from parallel import for_each
+
+# Observer profile line in the *Profil*.txt definition files, anchored to the line
+# start so lines without the marker are rejected at the first character
+_OBSERVER_RE = re.compile(r"^PROFILE:[^\r\n]+?_OBS:", re.MULTILINE)
+
+# Profile definition file names, matched against normcase names
+_PROFILE_DEF_RE = re.compile(fnmatch.translate(os.path.normcase("*Profil*.txt")))
+
+# TopSky file holding the Hoppie ACARS logon code, compared with normcase names
+_HOPPIE_CODE_FILE = os.path.normcase("TopSkyCPDLChoppieCode.txt")
+
+# .prf rows _update_profile_file reads or changes, all other rows are left unsplit
+_PROFILE_ROW_PREFIXES = ("LastSession\t", "TeamSpeakVccs\t", "Settings\t")
+
+# m_Column row of a General settings file, split before its last ":" field
+_MCOL_RE = re.compile(r"^(m_Column:(?:[^:\n]*:)*)([^:\n]*)$", re.MULTILINE)
+
+# Attributes _update_profile_file sets in the LastSession and TeamSpeakVccs rows,
+# with the position of each name for the per-file lookup tables
+_SESSION_KEYS = ("realname", "certificate", "password", "rating", "server", "tovatsim")
+_VCCS_KEYS = (
+    "Ts3NickName",
+    "Ts3G2GPtt",
+    "PlaybackMode",
+    "PlaybackDevice",
+    "CaptureMode",
+    "CaptureDevice",
+)
+_SESSION_POSITIONS = {key: position for position, key in enumerate(_SESSION_KEYS)}
+_VCCS_POSITIONS = {key: position for position, key in enumerate(_VCCS_KEYS)}
+
+# Symbology.txt rows holding a text size in their fourth field, ascending
+_SYMBOLOGY_ROWS = tuple(range(25, 63)) + (86, 87, 88, 90, 92, 93)
+
+
+# Package folders that never contain profiles; .prf files below them are ignored
+PROFILE_WALK_SKIP_DIRS = frozenset({"plugins", "topsky", "grp", "sounds"})
+
+
+def _walk_categorized(base_dir: Path, settings_dir: Path) -> Iterator[Tuple[str, Path]]:
+    """Yield (kind, path) for the .prf, *Profil*.txt and Hoppie code files"""
+    settings_key = os.path.normcase(os.path.normpath(settings_dir))
+    # The Hoppie code file lives under Plugins/TopSky, so skipped folders are
+    # still walked, just without looking for profiles in them
+    stack = [(os.path.normpath(base_dir), False, False)]
+    while stack:
+        directory, in_settings, in_skipped = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Like rglob, don't descend into symlinked folders
+                    if entry.is_dir(follow_symlinks=False):
+                        settings = in_settings or (
+                            os.path.normcase(entry.path) == settings_key
+                        )
+                        skipped = in_skipped or (
+                            entry.name.lower() in PROFILE_WALK_SKIP_DIRS
+                        )
+                        stack.append((entry.path, settings, skipped))
+                        continue
+
+                    name = os.path.normcase(entry.name)
+                    if name.endswith(".prf"):
+                        if not in_skipped:
+                            yield "prf", Path(entry.path)
+                    elif name == _HOPPIE_CODE_FILE:
+                        yield "hoppie", Path(entry.path)
+                    elif in_settings and _PROFILE_DEF_RE.match(name):
+                        yield "profile_def", Path(entry.path)
+        except OSError:
+            continue
+
+
+def _read_lines(file_path: Path) -> List[str]:
+    """Read a settings file into lines without their line endings"""
+    with open(file_path, "r", encoding="iso-8859-1") as f:
+        lines = f.read().split("\n")
+
+    if lines and not lines[-1]:
+        lines.pop()
+
+    return lines
+
+
+def _write_lines(file_path: Path, lines: List[str]):
+    """Write lines back with CRLF line endings, as EuroScope saves them"""
+    content = "".join(line + "\r\n" for line in lines).encode("iso-8859-1")
+
+    # Write next to the file and swap it in, so a failed write never leaves a
+    # truncated profile or settings file behind
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+def _read_rows(file_path: Path, delimiter: str) -> List[List[str]]:
+    """Read a delimited settings file into rows, an empty line becomes an empty row"""
+    return [line.split(delimiter) if line else [] for line in _read_lines(file_path)]
+
+
+def _write_rows(file_path: Path, rows: List[List[str]], delimiter: str):
+    """Write rows back with CRLF line endings, as EuroScope saves them"""
+    _write_lines(file_path, [delimiter.join(row) for row in rows])
 
 
 class ProfileUpdater:
     def __init__(self, config):
         self.config = config
+        # VCCS options are the same for every profile, so look them up once
+        self._vccs = {
+            key: config.get("VCCS", key)
+            for key in ("ptt", "mode", "playback", "capture")
+        }
+        # Files are updated on worker threads, each task collects its messages in
+        # _local.messages and prints them in one write when it is done
+        self._print_lock = threading.Lock()
+        self._local = threading.local()
 
     def update_all_profiles(self, package_info: Dict[str, str]):
         print("👤 Updating profiles...")
@@ -17,275 +140,359 @@ class ProfileUpdater:
         if self.config.use_subdirs:
             base_dir = base_dir / fir_code
 
-        self._update_observer_callsign(fir_code, base_dir)
+        settings_dir = base_dir / fir_code / "Settings"
+
+        files = {"prf": [], "profile_def": [], "hoppie": []}
+        for kind, file_path in _walk_categorized(base_dir, settings_dir):
+            files[kind].append(file_path)
 
-        for prf_file in base_dir.rglob("*.prf"):
-            print(f"   Processing {prf_file.name}")
-            self._update_profile_file(prf_file, package_info)
+        self._update_observer_callsign(settings_dir, files["profile_def"])
+
+        # The same values go into every profile
+        session_data = {
+            "realname": self.config.real_name,
+            "certificate": self.config.vatsim_cid,
+            "password": self.config.vatsim_password,
+            "rating": self.config.rating,
+            "server": "AUTOMATIC",
+            "tovatsim": "1",
+        }
 
-        self._update_hoppie_code(package_info, base_dir)
+        vccs_data = {
+            "Ts3NickName": self.config.vatsim_cid,
+            "Ts3G2GPtt": self._vccs["ptt"],
+            "PlaybackMode": self._vccs["mode"],
+            "PlaybackDevice": self._vccs["playback"],
+            "CaptureMode": self._vccs["mode"],
+            "CaptureDevice": self._vccs["capture"],
+        }
 
-    def _update_observer_callsign(self, fir_code: str, base_dir: Path):
+        session_values = [session_data[key] for key in _SESSION_KEYS]
+        vccs_values = [vccs_data[key] for key in _VCCS_KEYS]
+
+        verbose = self.config.verbose
+
+        def update_profile(prf_file: Path) -> List[List[str]]:
+            if verbose:
+                self._print(f"   Processing {prf_file.name}")
+            return self._update_profile_file(prf_file, session_values, vccs_values)
+
+        # Profiles usually share settings files, and every update rewrites the whole
+        # file, so update each file once and from a single thread
+        settings_updates: Dict[Path, List[str]] = {}
+        for settings_lines in for_each(self._buffered(update_profile), files["prf"]):
+            for settings_line in settings_lines:
+                full_path = self._resolve_settings_file(settings_line, base_dir)
+                if full_path is not None:
+                    settings = settings_updates.setdefault(full_path, [])
+                    if settings_line[1] not in settings:
+                        settings.append(settings_line[1])
+
+        for_each(
+            self._buffered(lambda update: self._update_settings_file(*update)),
+            list(settings_updates.items()),
+        )
+
+        self._update_hoppie_code(package_info, base_dir, files["hoppie"])
+
+    def _update_observer_callsign(self, settings_dir: Path, profile_files: List[Path]):
         print("   Setting observer callsign...")
 
         if not self.config.initials:
             print("      ⚠️  No initials configured, skipping observer callsign update")
             return
 
-        settings_dir = base_dir / fir_code / "Settings"
         if not settings_dir.exists():
             print(f"      ⚠️  Settings directory not found: {settings_dir}")
             return
 
-        profile_files = list(settings_dir.rglob("*Profil*.txt"))
-
         if not profile_files:
             print("      ⚠️  No profile definition files found")
             return
 
         observer_callsign = self.config.observer_callsign
+        replacement = f"PROFILE:{observer_callsign}:"
 
-        for profile_file in profile_files:
+        def update_definition(profile_file: Path):
             try:
                 with open(profile_file, "r", encoding="iso-8859-1") as f:
                     content = f.read()
 
-                pattern = r"PROFILE:.+_OBS:"
-                replacement = f"PROFILE:{observer_callsign}:"
+                # Most definition files have no observer profile at all
+                if "PROFILE:" not in content or "_OBS:" not in content:
+                    return
 
-                new_content = re.sub(pattern, replacement, content)
+                new_content = _OBSERVER_RE.sub(replacement, content)
 
                 if new_content != content:
                     with open(profile_file, "w", encoding="iso-8859-1") as f:
                         f.write(new_content)
-                    print(
+                    self._print(
                         f"      ✓ Updated observer callsign to {observer_callsign} in {profile_file.name}"
                     )
 
             except Exception as e:
-                print(
+                self._print(
                     f"      ⚠️  Error updating observer callsign in {profile_file.name}: {e}"
                 )
 
-    def _update_profile_file(self, prf_file: Path, package_info: Dict[str, str]):
-        profile_data = []
-        session_attributes = {
-            "realname": False,
-            "certificate": False,
-            "password": False,
-            "rating": False,
-            "server": False,
-            "tovatsim": False,
-        }
-        vccs_attributes = {
-            "Ts3NickName": False,
-            "Ts3G2GPtt": False,
-            "PlaybackMode": False,
-            "PlaybackDevice": False,
-            "CaptureMode": False,
-            "CaptureDevice": False,
-        }
-
-        try:
-            with open(prf_file, "r", encoding="iso-8859-1") as f:
-                reader = csv.reader(f, delimiter="\t")
-                for i, line in enumerate(reader):
-                    if not line:
-                        profile_data.append(line)
-                        continue
+        for_each(self._buffered(update_definition), profile_files)
 
-                    if len(line) >= 2:
-                        if line[0] == "LastSession" and line[1] in session_attributes:
-                            session_attributes[line[1]] = i
-                        elif line[0] == "TeamSpeakVccs" and line[1] in vccs_attributes:
-                            vccs_attributes[line[1]] = i
+    def _update_profile_file(
+        self, prf_file: Path, session_values: List[str], vccs_values: List[str]
+    ) -> List[List[str]]:
+        """Update the session and VCCS rows of a profile, return its Settings rows"""
+        lines = []
+        # Line index -> fields, for the session and VCCS rows found while reading
+        rows = {}
+        settings_lines = []
+        # Line index of each attribute row, in _SESSION_KEYS/_VCCS_KEYS order
+        session_lines = [None] * len(_SESSION_KEYS)
+        vccs_lines = [None] * len(_VCCS_KEYS)
 
-                        if line[0] == "Settings":
-                            self._update_settings_file(line, package_info)
-
-                    profile_data.append(line)
+        try:
+            lines = _read_lines(prf_file)
+            for i, line in enumerate(lines):
+                if not line.startswith(_PROFILE_ROW_PREFIXES):
+                    continue
+
+                fields = line.split("\t")
+                if fields[0] == "LastSession" and fields[1] in _SESSION_POSITIONS:
+                    session_lines[_SESSION_POSITIONS[fields[1]]] = i
+                    rows[i] = fields
+                elif fields[0] == "TeamSpeakVccs" and fields[1] in _VCCS_POSITIONS:
+                    vccs_lines[_VCCS_POSITIONS[fields[1]]] = i
+                    rows[i] = fields
+                elif fields[0] == "Settings":
+                    settings_lines.append(fields)
 
         except Exception as e:
-            print(f"      ⚠️  Error reading profile: {e}")
-            return
-
-        session_data = {
-            "realname": self.config.real_name,
-            "certificate": self.config.vatsim_cid,
-            "password": self.config.vatsim_password,
-            "rating": self.config.rating,
-            "server": "AUTOMATIC",
-            "tovatsim": "1",
-        }
-
-        vccs_data = {
-            "Ts3NickName": self.config.vatsim_cid,
-            "Ts3G2GPtt": self.config.get("VCCS", "ptt"),
-            "PlaybackMode": self.config.get("VCCS", "mode"),
-            "PlaybackDevice": self.config.get("VCCS", "playback"),
-            "CaptureMode": self.config.get("VCCS", "mode"),
-            "CaptureDevice": self.config.get("VCCS", "capture"),
-        }
+            self._print(f"      ⚠️  Error reading profile: {e}")
+            return []
+
+        # Set the value of rows found while reading, collect the missing ones to
+        # append them in one go
+        missing_lines = []
+        changed_lines = set()
+        for attr, value, existing_line in zip(
+            _SESSION_KEYS, session_values, session_lines
+        ):
+            if existing_line is None:
+                missing_lines.append(f"LastSession\t{attr}\t{value}")
+            elif len(rows[existing_line]) >= 3:
+                if rows[existing_line][2] != value:
+                    rows[existing_line][2] = value
+                    changed_lines.add(existing_line)
+            else:
+                rows[existing_line].append(value)
+                changed_lines.add(existing_line)
+
+        for attr, value, existing_line in zip(_VCCS_KEYS, vccs_values, vccs_lines):
+            if not value:
+                continue
+
+            if existing_line is None:
+                missing_lines.append(f"TeamSpeakVccs\t{attr}\t{value}")
+            elif len(rows[existing_line]) >= 3:
+                if rows[existing_line][2] != value:
+                    rows[existing_line][2] = value
+                    changed_lines.add(existing_line)
+            else:
+                rows[existing_line].append(value)
+                changed_lines.add(existing_line)
 
-        for attr, value in session_data.items():
-            profile_data = self._add_or_update_attribute(
-                profile_data, "LastSession", attr, value, session_attributes[attr]
-            )
+        # Already up to date, e.g. when rerun on an updated install
+        if not changed_lines and not missing_lines:
+            return settings_lines
 
-        for attr, value in vccs_data.items():
-            if value:
-                profile_data = self._add_or_update_attribute(
-                    profile_data, "TeamSpeakVccs", attr, value, vccs_attributes[attr]
-                )
+        for i in changed_lines:
+            lines[i] = "\t".join(rows[i])
+        lines.extend(missing_lines)
 
         try:
-            with open(prf_file, "w", newline="", encoding="iso-8859-1") as f:
-                writer = csv.writer(f, delimiter="\t")
-                for line in profile_data:
-                    writer.writerow(line)
+            _write_lines(prf_file, lines)
         except Exception as e:
-            print(f"      ⚠️  Error writing profile: {e}")
-
-    def _add_or_update_attribute(
-        self, data: List, section: str, key: str, value: str, existing_line: int
-    ) -> List:
-        if existing_line is not False:
-            if len(data[existing_line]) >= 3:
-                data[existing_line][2] = value
-            else:
-                data[existing_line].append(value)
-        else:
-            data.append([section, key, value])
+            self._print(f"      ⚠️  Error writing profile: {e}")
 
-        return data
+        return settings_lines
 
-    def _update_settings_file(self, settings_line: List, package_info: Dict[str, str]):
+    def _resolve_settings_file(
+        self, settings_line: List[str], base_dir: Path
+    ) -> Optional[Path]:
+        """Path of the existing file a profile Settings row points to, if any"""
         if len(settings_line) < 3:
-            return
-
-        settings_path = Path(settings_line[2])
-        if settings_path == Path("."):
-            return
+            return None
 
-        if settings_path.parts[0] == ".":
-            settings_path = Path(*settings_path.parts[1:])
+        # Strip "./" prefixes as strings instead of through Path.parts
+        settings_path = settings_line[2]
+        while settings_path.startswith(("./", ".\\")):
+            settings_path = settings_path[2:].lstrip("/\\")
 
-        base_dir = self.config.euroscope_docs
-        if self.config.use_subdirs:
-            base_dir = base_dir / package_info["fir"]
+        if settings_path in ("", "."):
+            return None
 
         full_path = base_dir / settings_path
 
         if not full_path.exists():
-            return
+            return None
 
-        if settings_line[1] == "SettingsfileSYMBOLOGY":
-            self._update_symbology_file(full_path)
-        elif settings_line[1] == "SettingsfilePROFILE":
-            self._update_profiles_file(full_path)
-        elif self.config.text_size and "General" in settings_line[1]:
-            self._update_text_size_in_file(full_path)
+        return full_path
+
+    def _update_settings_file(self, full_path: Path, settings: List[str]):
+        """Apply the updates for every Settings row name that points to full_path"""
+        text_size = self.config.text_size
+        for setting in settings:
+            if setting == "SettingsfileSYMBOLOGY":
+                self._update_symbology_file(full_path)
+            elif setting == "SettingsfilePROFILE":
+                self._update_profiles_file(full_path)
+            elif text_size and "General" in setting:
+                self._update_text_size_in_file(full_path)
 
     def _update_symbology_file(self, symbology_path: Path):
-        if not self.config.text_size:
+        text_size = self.config.text_size
+        if not text_size:
             return
 
         try:
-            settings = []
-            with open(symbology_path, "r", encoding="iso-8859-1") as f:
-                reader = csv.reader(f, delimiter=":")
-                settings = list(reader)
+            settings = _read_rows(symbology_path, ":")
 
             if not settings or "SYMBOLOGY" not in settings[0][0]:
                 return
 
-            rows_to_update = list(range(25, 63)) + [86, 87, 88, 90, 92, 93]
-
-            for row in rows_to_update:
-                if row < len(settings) and len(settings[row]) >= 4:
-                    settings[row][3] = self.config.text_size
+            changed = False
+            row_count = len(settings)
+            for row in _SYMBOLOGY_ROWS:
+                if row >= row_count:
+                    break
+                if len(settings[row]) >= 4 and settings[row][3] != text_size:
+                    settings[row][3] = text_size
+                    changed = True
+
+            # Already at the configured size, e.g. when rerun on an updated install
+            if not changed:
+                return
 
-            with open(symbology_path, "w", newline="", encoding="iso-8859-1") as f:
-                writer = csv.writer(f, delimiter=":")
-                writer.writerows(settings)
+            _write_rows(symbology_path, settings, ":")
 
-            print(f"      ✓ Updated symbology text size: {self.config.text_size}")
+            self._print(f"      ✓ Updated symbology text size: {text_size}")
 
         except Exception as e:
-            print(f"      ⚠️  Error updating symbology: {e}")
+            self._print(f"      ⚠️  Error updating symbology: {e}")
 
     def _update_profiles_file(self, profiles_path: Path):
         if not self.config.initials:
             return
 
+        observer_callsign = f"{self.config.initials}_OBS"
+
         try:
-            settings = []
-            with open(profiles_path, "r", encoding="iso-8859-1") as f:
-                reader = csv.reader(f, delimiter=":")
-                settings = list(reader)
+            settings = _read_rows(profiles_path, ":")
 
+            changed = False
             for line in settings:
-                if len(line) >= 2 and line[0] == "PROFILE" and line[1].endswith("_OBS"):
-                    line[1] = f"{self.config.initials}_OBS"
+                if (
+                    len(line) >= 2
+                    and line[0] == "PROFILE"
+                    and line[1].endswith("_OBS")
+                    and line[1] != observer_callsign
+                ):
+                    line[1] = observer_callsign
+                    changed = True
 
-            with open(profiles_path, "w", newline="", encoding="iso-8859-1") as f:
-                writer = csv.writer(f, delimiter=":")
-                writer.writerows(settings)
+            if not changed:
+                return
+
+            _write_rows(profiles_path, settings, ":")
 
-            print(f"      ✓ Updated observer callsign: {self.config.observer_callsign}")
+            self._print(
+                f"      ✓ Updated observer callsign: {self.config.observer_callsign}"
+            )
 
         except Exception as e:
-            print(f"      ⚠️  Error updating profiles: {e}")
+            self._print(f"      ⚠️  Error updating profiles: {e}")
 
     def _update_text_size_in_file(self, file_path: Path):
-        if not self.config.text_size:
+        text_size = self.config.text_size
+        if not text_size:
             return
 
+        def set_text_size(match: "re.Match") -> str:
+            # Columns sized 0.0 are hidden and stay that way
+            if match.group(2) in ("0.0", text_size):
+                return match.group(0)
+            return match.group(1) + text_size
+
         try:
-            settings = []
-            with open(file_path, "r", encoding="iso-8859-1") as f:
-                reader = csv.reader(f, delimiter=":")
-                settings = list(reader)
+            content = "\n".join(_read_lines(file_path))
 
-            for line in settings:
-                if (
-                    len(line) >= 2
-                    and line[0] == "m_Column"
-                    and len(line) > 1
-                    and line[-1] != "0.0"
-                ):
-                    line[-1] = self.config.text_size
+            new_content = _MCOL_RE.sub(set_text_size, content)
+
+            if new_content == content:
+                return
 
-            with open(file_path, "w", newline="", encoding="iso-8859-1") as f:
-                writer = csv.writer(f, delimiter=":")
-                writer.writerows(settings)
+            _write_lines(file_path, new_content.split("\n"))
 
-            print(f"      ✓ Updated text size in {file_path.name}")
+            self._print(f"      ✓ Updated text size in {file_path.name}")
 
         except Exception as e:
-            print(f"      ⚠️  Error updating text size: {e}")
+            self._print(f"      ⚠️  Error updating text size: {e}")
 
-    def _update_hoppie_code(self, package_info: Dict[str, str], base_dir: Path):
+    def _update_hoppie_code(
+        self, package_info: Dict[str, str], base_dir: Path, hoppie_files: List[Path]
+    ):
         if not self.config.hoppie_code:
             return
 
         fir_code = package_info['fir']
 
-        hoppie_files = list(base_dir.rglob("**/TopSkyCPDLChoppieCode.txt"))
-
         if not hoppie_files:
             print(f"   ⚠️  No Hoppie code files found in {fir_code}")
             return
 
-        files_updated = 0
-        for hoppie_file in hoppie_files:
+        hoppie_code = self.config.hoppie_code
+
+        def update_hoppie_file(hoppie_file: Path) -> bool:
             try:
                 with open(hoppie_file, 'w', encoding='utf-8') as f:
-                    f.write(self.config.hoppie_code)
-                print(f"   ✓ Updated Hoppie code in {hoppie_file.relative_to(base_dir)}")
-                files_updated += 1
+                    f.write(hoppie_code)
+                # The walk normalized its root; relpath normalizes base_dir the same way
+                relative_path = os.path.relpath(hoppie_file, base_dir)
+                self._print(f"   ✓ Updated Hoppie code in {relative_path}")
+                return True
             except Exception as e:
-                print(f"   ⚠️  Error updating Hoppie code in {hoppie_file.name}: {e}")
+                self._print(
+                    f"   ⚠️  Error updating Hoppie code in {hoppie_file.name}: {e}"
+                )
+                return False
+
+        files_updated = sum(for_each(self._buffered(update_hoppie_file), hoppie_files))
 
         if files_updated > 0:
             print(f"   ✓ Updated Hoppie code in {files_updated} files")
+
+    def _buffered(self, func: Callable) -> Callable:
+        """Wrap a per-file task so its messages are printed together when it ends"""
+
+        def task(item):
+            self._local.messages = []
+            try:
+                return func(item)
+            finally:
+                messages = self._local.messages
+                self._local.messages = None
+                if messages:
+                    with self._print_lock:
+                        sys.stdout.write("".join(f"{line}\n" for line in messages))
+
+        return task
+
+    def _print(self, message: str):
+        """Print a progress message, or collect it while a buffered task is running"""
+        messages = getattr(self._local, "messages", None)
+        if messages is not None:
+            messages.append(message)
+            return
+
+        with self._print_lock:
+            print(message)
@@ -0,0 +1,37 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from config_manager import FastConfigParser
+
+
+class FastConfigParserTest(unittest.TestCase):
+    def read(self, text):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = Path(tmp.name) / "config.ini"
+        path.write_text(text)
+
+        parser = FastConfigParser()
+        parser.read(path)
+        return parser
+
+    def test_section_header_with_comment(self):
+        parser = self.read("[PATHS] ; note\ndownload_dir = C:\\dl\n[LOGIN]\ncid = 1\n")
+
+        self.assertEqual(parser.get("PATHS", "download_dir"), "C:\\dl")
+        self.assertEqual(parser.get("LOGIN", "cid"), "1")
+        self.assertEqual(parser.get("PATHS", "cid"), "")
+
+    def test_continuation_lines(self):
+        parser = self.read("[VCCS]\nptt = a\n  b\n")
+
+        self.assertEqual(parser.get("VCCS", "ptt"), "a\nb")
+
+    def test_unparseable_line_raises(self):
+        with self.assertRaisesRegex(ValueError, "line 3"):
+            self.read("[PATHS]\ndownload_dir = x\n[LOGIN] cid = 1\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
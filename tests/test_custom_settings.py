@@ -0,0 +1,53 @@
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from custom_settings import CustomSettings
+
+
+class BadPatternTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.base_dir = Path(tmp.name)
+        self.settings_file = self.base_dir / "Settings.txt"
+        self.settings_file.write_bytes(b"old_text\r\n")
+
+        config = SimpleNamespace(euroscope_docs=self.base_dir, use_subdirs=False)
+        self.settings = CustomSettings(config)
+
+    def apply(self, *replacements):
+        def handler(base_dir):
+            for pattern, replacement in replacements:
+                self.settings.replace_in_file(
+                    self.settings_file, pattern, replacement
+                )
+            self.settings.replace_in_profiles(base_dir, "*.prf", list(replacements))
+
+        self.settings._fir_dispatch["TEST"] = handler
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.settings.apply_all_settings({"fir": "TEST"})
+        return output.getvalue()
+
+    def test_invalid_regex_is_reported(self):
+        output = self.apply((r"old_(text", "x"), (r"old_text", "new_text"))
+
+        self.assertIn("⚠️  Error updating Settings.txt", output)
+        self.assertIn("✓ Applied custom settings for TEST", output)
+        self.assertEqual(self.settings_file.read_bytes(), b"new_text\r\n")
+
+    def test_pattern_outside_latin_1_is_reported(self):
+        output = self.apply(("foo€", "bar"))
+
+        self.assertIn("⚠️  Error updating Settings.txt", output)
+        self.assertIn("✓ Applied custom settings for TEST", output)
+        self.assertEqual(self.settings_file.read_bytes(), b"old_text\r\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
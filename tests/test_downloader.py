@@ -0,0 +1,51 @@
+import unittest
+from pathlib import Path
+
+from downloader import DOWNLOAD_RULES, _find_package_url
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class FindPackageUrlTest(unittest.TestCase):
+    def setUp(self):
+        self.index_page = (FIXTURES / "aero_nav_edxx_index.html").read_bytes()
+
+    def find(self, fir_code):
+        return _find_package_url(self.index_page, DOWNLOAD_RULES[fir_code]["pattern"])
+
+    def test_skips_comments_scripts_styles_and_other_attributes(self):
+        self.assertEqual(
+            self.find("EDGG"),
+            "https://files.aero-nav.com/EDGG/EDGG-Full-Package_20250123-120512-2501.zip",
+        )
+
+    def test_single_quoted_and_unquoted_href(self):
+        self.assertEqual(
+            self.find("EDMM"),
+            "https://files.aero-nav.com/EDMM/EDMM-Full-Package_20250123-130044-2501.zip",
+        )
+        self.assertEqual(
+            self.find("EDWW"),
+            "https://files.aero-nav.com/EDWW/EDWW-Full-Package_20250122-091500-2501.zip",
+        )
+
+    def test_entities_are_unescaped(self):
+        self.assertEqual(
+            self.find("EDXX"),
+            "https://files.aero-nav.com/EDXX/FIS_20250123-2501.zip?dl=1&src=index",
+        )
+
+    def test_no_matching_link(self):
+        self.assertIsNone(self.find("LPPO"))
+
+    def test_declared_charset_is_used(self):
+        # "Ã§" in cp1252 is the same bytes as "ç" in UTF-8, so only the <meta>
+        # charset decides which one comes out
+        url = "https://files.aero-nav.com/LPPO/Install-Package_Ã§.zip"
+        page = f'<meta charset="windows-1252"><a href="{url}">'.encode("cp1252")
+        self.assertEqual(
+            _find_package_url(page, DOWNLOAD_RULES["LPPO"]["pattern"]), url
+        )
+
+if __name__ == "__main__":
+    unittest.main()